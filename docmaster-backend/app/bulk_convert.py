@@ -0,0 +1,333 @@
+"""
+app/bulk_convert.py
+오프라인 일괄 변환 CLI (python -m app.bulk_convert).
+디렉토리 트리의 PDF/PPTX 를 HTTP 서버 없이 프로세스 풀에서 변환해 <파일명>.md 와 <파일명>.meta.json 을 씁니다
+(확장자 유지: report.pdf → report.pdf.md, report.pptx → report.pptx.md).
+- 입력 트리 구조를 출력 디렉토리에 그대로 유지
+- 파일 SHA-256 기준 매니페스트(manifest.jsonl)에 완료 기록 → 중단 후 재실행 시 끝난 파일은 건너뜀
+- 내용이 같은 파일은 한 번만 변환하고 결과를 복사 (재실행 시 새 경로에 추가된 같은 내용 파일에도 복사)
+- 워커 프로세스가 비정상 종료(MuPDF 세그폴트·OOM kill)하면 풀을 다시 만들어 남은 파일을 계속 변환.
+  종료 당시 실행 중이던 파일만 하나씩 격리해 다시 시도하고, MAX_ATTEMPTS 회 실패하면 failed 로 기록
+- 종료 시 처리량 요약(파일/초, MB/초, 페이지/초) 출력
+
+실행 방법:
+  cd docmaster-backend
+  python -m app.bulk_convert ./archive -o ./converted --workers 8
+  python -m app.bulk_convert ./archive -o ./converted --table-format csv --dedup
+"""
+
+import argparse
+import hashlib
+import json
+import os
+import shutil
+import sys
+import time
+from collections import deque
+from concurrent.futures import FIRST_COMPLETED, Future, ProcessPoolExecutor, wait
+from concurrent.futures.process import BrokenProcessPool
+from pathlib import Path
+from typing import Any, Callable
+
+from app.extract_constants import TABLE_FORMAT_MARKDOWN, TABLE_FORMATS
+from app.pipeline import SUPPORTED_EXTENSIONS, convert_document
+
+MANIFEST_NAME = "manifest.jsonl"
+
+STATUS_DONE = "done"
+STATUS_FAILED = "failed"
+
+# 워커 프로세스 비정상 종료에 연루된 파일의 최대 시도 횟수 (풀 전체 실패 1회 + 단독 재시도)
+MAX_ATTEMPTS = 2
+# 워커 프로세스 하나가 변환할 최대 파일 수 (pymupdf 메모리 누적 방지, Python 3.11+)
+MAX_TASKS_PER_CHILD = 50
+
+# (sha256, 같은 내용의 입력 경로들)
+WorkItem = tuple[str, list[Path]]
+
+
+def file_sha256(path: Path, chunk_size: int = 1024 * 1024) -> str:
+    """파일 내용의 SHA-256 hex (청크 단위로 읽음)."""
+    h = hashlib.sha256()
+    with path.open("rb") as f:
+        while chunk := f.read(chunk_size):
+            h.update(chunk)
+    return h.hexdigest()
+
+
+def find_documents(input_dir: Path) -> list[Path]:
+    """input_dir 아래 PDF/PPTX 파일 (정렬, 임시 잠금 파일 ~$ 제외)."""
+    return sorted(
+        p for p in input_dir.rglob("*")
+        if p.is_file() and p.suffix.lower() in SUPPORTED_EXTENSIONS and not p.name.startswith("~$")
+    )
+
+
+def output_paths(src: Path, input_dir: Path, output_dir: Path) -> tuple[Path, Path]:
+    """
+    입력 상대 경로를 유지한 (<파일명>.md, <파일명>.meta.json) 출력 경로.
+    확장자를 유지해 같은 폴더의 report.pdf / report.pptx 가 서로 덮어쓰지 않도록 함.
+    """
+    base = output_dir / src.relative_to(input_dir)
+    return base.with_name(base.name + ".md"), base.with_name(base.name + ".meta.json")
+
+
+def _copy_outputs(
+    md_path: Path,
+    meta_path: Path,
+    targets: list[Path],
+    input_dir: Path,
+    output_dir: Path,
+    *,
+    missing_only: bool = False,
+) -> int:
+    """
+    변환 결과를 같은 내용의 다른 경로들에 복사. 반환: 복사한 경로 수.
+    missing_only=True 이면 출력이 이미 있는 경로는 건너뜀 (재실행 시).
+    """
+    copied = 0
+    for target in targets:
+        target_md, target_meta = output_paths(target, input_dir, output_dir)
+        if target_md == md_path or (missing_only and target_md.exists()):
+            continue
+        target_md.parent.mkdir(parents=True, exist_ok=True)
+        shutil.copyfile(md_path, target_md)
+        if meta_path.exists():
+            shutil.copyfile(meta_path, target_meta)
+        copied += 1
+    return copied
+
+
+def load_manifest(manifest_path: Path) -> dict[str, dict[str, Any]]:
+    """매니페스트(JSONL)를 {sha256: 마지막 기록} 으로 읽음. 중단 시 잘린 마지막 줄은 무시."""
+    entries: dict[str, dict[str, Any]] = {}
+    if not manifest_path.exists():
+        return entries
+    with manifest_path.open(encoding="utf-8") as f:
+        for line in f:
+            try:
+                entry = json.loads(line)
+            except json.JSONDecodeError:
+                continue
+            entries[entry["sha256"]] = entry
+    return entries
+
+
+def _convert_one(src: str, md_path: str, meta_path: str, options: dict[str, Any]) -> dict[str, Any]:
+    """(워커 프로세스) 파일 1건 변환 후 .md / .meta.json 저장. 결과 요약 dict 반환."""
+    started = time.perf_counter()
+    markdown_text, meta = convert_document(src, Path(src).suffix.lower(), **options)
+    elapsed = time.perf_counter() - started
+
+    Path(md_path).parent.mkdir(parents=True, exist_ok=True)
+    Path(md_path).write_text(markdown_text, encoding="utf-8")
+    meta = {"source": src, "elapsed_sec": round(elapsed, 3), **meta}
+    Path(meta_path).write_text(json.dumps(meta, ensure_ascii=False, indent=2), encoding="utf-8")
+
+    return {
+        "elapsed_sec": round(elapsed, 3),
+        "pages": meta.get("page_count", 0) + meta.get("slide_count", 0),
+        "md_bytes": len(markdown_text.encode("utf-8")),
+    }
+
+
+def _new_pool(workers: int) -> ProcessPoolExecutor:
+    """변환용 프로세스 풀. Python 3.11+ 에서는 워커당 변환 수를 제한해 주기적으로 새 프로세스로 교체."""
+    if sys.version_info >= (3, 11):
+        return ProcessPoolExecutor(max_workers=workers, max_tasks_per_child=MAX_TASKS_PER_CHILD)
+    return ProcessPoolExecutor(max_workers=workers)
+
+
+def _convert_batch(
+    items: list[WorkItem],
+    workers: int,
+    submit_args: Callable[[WorkItem], tuple],
+    on_done: Callable[[WorkItem, dict[str, Any] | None, BaseException | None], None],
+) -> tuple[list[WorkItem], list[WorkItem]]:
+    """
+    items 를 새 프로세스 풀에서 변환 (동시에 실행 중인 작업은 workers 개까지만 제출).
+    완료·예외가 난 항목마다 on_done(항목, 결과, 예외) 호출.
+    워커 비정상 종료로 풀이 깨지면 (그때 실행 중이던 항목, 아직 제출하지 않은 항목) 을 반환. 정상 종료 시 ([], []).
+    """
+    waiting = deque(items)
+    running: dict[Future, WorkItem] = {}
+    with _new_pool(workers) as pool:
+        try:
+            while waiting or running:
+                while waiting and len(running) < workers:
+                    item = waiting.popleft()
+                    try:
+                        future = pool.submit(_convert_one, *submit_args(item))
+                    except BrokenProcessPool:
+                        waiting.appendleft(item)
+                        raise
+                    running[future] = item
+
+                finished, _ = wait(running, return_when=FIRST_COMPLETED)
+                broken = False
+                for future in finished:
+                    try:
+                        result = future.result()
+                    except BrokenProcessPool:
+                        broken = True
+                        continue
+                    except Exception as e:
+                        on_done(running.pop(future), None, e)
+                    else:
+                        on_done(running.pop(future), result, None)
+                if broken:
+                    raise BrokenProcessPool
+        except BrokenProcessPool:
+            return list(running.values()), list(waiting)
+    return [], []
+
+
+def run(
+    input_dir: Path,
+    output_dir: Path,
+    *,
+    workers: int,
+    options: dict[str, Any],
+    force: bool = False,
+) -> dict[str, Any]:
+    """input_dir 를 변환해 output_dir 에 쓰고 처리량 요약을 반환."""
+    output_dir.mkdir(parents=True, exist_ok=True)
+    manifest_path = output_dir / MANIFEST_NAME
+    manifest = {} if force else load_manifest(manifest_path)
+
+    sources = find_documents(input_dir)
+    started = time.perf_counter()
+
+    # 내용 해시로 그룹화: 해시당 첫 파일만 변환, 나머지는 결과 복사
+    by_hash: dict[str, list[Path]] = {}
+    for src in sources:
+        by_hash.setdefault(file_sha256(src), []).append(src)
+
+    summary: dict[str, Any] = {
+        "files": len(sources),
+        "converted": 0,
+        "skipped": 0,
+        "duplicates": 0,
+        "failed": 0,
+        "pages": 0,
+        "input_bytes": 0,
+    }
+    todo: dict[str, list[Path]] = {}
+    for sha256, paths in by_hash.items():
+        entry = manifest.get(sha256)
+        if entry and entry.get("status") == STATUS_DONE and entry.get("options") == options:
+            done_md = output_dir / entry["output"]
+            if done_md.exists():
+                # 이전 실행 이후 새 경로에 추가된 같은 내용 파일에는 기존 결과 복사
+                done_meta = done_md.with_name(done_md.name.removesuffix(".md") + ".meta.json")
+                copied = _copy_outputs(done_md, done_meta, paths, input_dir, output_dir, missing_only=True)
+                summary["duplicates"] += copied
+                summary["skipped"] += len(paths) - copied
+                continue
+        todo[sha256] = paths
+
+    total = len(todo)
+    progress = {"done": 0}
+
+    def submit_args(item: WorkItem) -> tuple:
+        md_path, meta_path = output_paths(item[1][0], input_dir, output_dir)
+        return str(item[1][0]), str(md_path), str(meta_path), options
+
+    with manifest_path.open("a", encoding="utf-8") as manifest_file:
+        def on_done(item: WorkItem, result: dict[str, Any] | None, error: BaseException | None) -> None:
+            sha256, paths = item
+            md_path, meta_path = output_paths(paths[0], input_dir, output_dir)
+            progress["done"] += 1
+            done = progress["done"]
+            entry: dict[str, Any] = {
+                "sha256": sha256,
+                "source": str(paths[0].relative_to(input_dir)),
+                "options": options,
+            }
+            if result is None:
+                summary["failed"] += len(paths)
+                entry.update({"status": STATUS_FAILED, "error": f"{type(error).__name__}: {error}"})
+                print(f"[{done}/{total}] 실패: {entry['source']} ({entry['error']})", file=sys.stderr)
+            else:
+                # 같은 내용의 다른 경로에는 결과 복사
+                _copy_outputs(md_path, meta_path, paths[1:], input_dir, output_dir)
+                summary["converted"] += 1
+                summary["duplicates"] += len(paths) - 1
+                summary["pages"] += result["pages"]
+                summary["input_bytes"] += paths[0].stat().st_size
+                entry.update({
+                    "status": STATUS_DONE,
+                    "output": str(md_path.relative_to(output_dir)),
+                    **result,
+                })
+                print(f"[{done}/{total}] {entry['source']} ({result['elapsed_sec']}s)", file=sys.stderr)
+            manifest_file.write(json.dumps(entry, ensure_ascii=False) + "\n")
+            manifest_file.flush()
+
+        attempts: dict[str, int] = {}
+        pending: list[WorkItem] = list(todo.items())
+        while pending:
+            crashed, pending = _convert_batch(pending, workers, submit_args, on_done)
+            if crashed:
+                print(f"워커 프로세스 비정상 종료: 실행 중이던 {len(crashed)}건을 하나씩 다시 시도", file=sys.stderr)
+            # 풀이 깨질 때 실행 중이던 파일만 하나씩 격리 실행해 원인 파일을 가려냄 (나머지는 다음 풀에서 계속)
+            suspects = deque(crashed)
+            while suspects:
+                item = suspects.popleft()
+                attempts[item[0]] = attempts.get(item[0], 0) + 1
+                if attempts[item[0]] >= MAX_ATTEMPTS:
+                    on_done(item, None, BrokenProcessPool(f"워커 프로세스 비정상 종료 ({MAX_ATTEMPTS}회)"))
+                    continue
+                crashed, _ = _convert_batch([item], 1, submit_args, on_done)
+                suspects.extend(crashed)
+
+    elapsed = time.perf_counter() - started
+    summary.update({
+        "workers": workers,
+        "elapsed_sec": round(elapsed, 3),
+        "files_per_sec": round(summary["converted"] / elapsed, 3) if elapsed else 0.0,
+        "mb_per_sec": round(summary["input_bytes"] / 1024 / 1024 / elapsed, 3) if elapsed else 0.0,
+        "pages_per_sec": round(summary["pages"] / elapsed, 3) if elapsed else 0.0,
+    })
+    return summary
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(
+        prog="python -m app.bulk_convert",
+        description="PDF/PPTX 디렉토리를 마크다운으로 일괄 변환 (중단 후 재실행 시 이어서 진행)",
+    )
+    parser.add_argument("input_dir", type=Path, help="PDF/PPTX 입력 디렉토리")
+    parser.add_argument("-o", "--output-dir", type=Path, required=True, help=".md / .meta.json 출력 디렉토리")
+    parser.add_argument("-w", "--workers", type=int, default=os.cpu_count() or 1, help="프로세스 수 (기본: CPU 수)")
+    parser.add_argument("--table-format", choices=TABLE_FORMATS, default=TABLE_FORMAT_MARKDOWN)
+    parser.add_argument("--dedup", action="store_true", help="반복 페이지/슬라이드·표를 역참조로 교체")
+    parser.add_argument("--ocr-images", action="store_true", help="PPTX 그림 도형 OCR (pytesseract 필요)")
+    parser.add_argument("--no-refine", action="store_true", help="추출 MD 1차 정제 생략")
+    parser.add_argument("--no-normalize", action="store_true", help="금액/날짜 정규화 생략")
+    parser.add_argument("--force", action="store_true", help="매니페스트를 무시하고 모두 다시 변환")
+    args = parser.parse_args(argv)
+
+    if not args.input_dir.is_dir():
+        parser.error(f"입력 디렉토리가 없습니다: {args.input_dir}")
+
+    options = {
+        "refine": not args.no_refine,
+        "normalize": not args.no_normalize,
+        "dedup": args.dedup,
+        "table_format": args.table_format,
+        "ocr_images": args.ocr_images,
+    }
+    summary = run(
+        args.input_dir.resolve(),
+        args.output_dir.resolve(),
+        workers=max(1, args.workers),
+        options=options,
+        force=args.force,
+    )
+    print(json.dumps(summary, ensure_ascii=False, indent=2))
+    return 1 if summary["failed"] else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
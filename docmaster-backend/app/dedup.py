@@ -0,0 +1,246 @@
+"""
+app/dedup.py
+페이지/슬라이드 본문과 [[TABLE]] 블록의 (유사) 중복 제거 모듈.
+
+반복되는 안건 슬라이드, 면책 페이지, 같은 표가 여러 번 나오는 문서에서
+첫 번째만 남기고 이후 사본은 짧은 역참조("_(동일 내용: Slide 3)_")로 바꿔 응답 크기와 토큰을 줄입니다.
+- 본문: 표를 뺀 텍스트의 단어 shingle 기반 64bit SimHash + 밴드 인덱스로 근사 중복 탐색 (문서 길이에 선형).
+        후보는 숫자 토큰(금액·날짜·수량) 구성이 완전히 같을 때만 중복으로 확정하고,
+        본문에 표가 있으면 표까지 정확히 같을 때만 본문 전체를 교체
+- 표  : 공백을 정규화한 표 텍스트의 blake2b 다이제스트 완전 일치 (숫자 한 칸만 달라도 다른 표로 취급).
+        table_format=json 이면 블록의 table_ref 대신 참조하는 meta.tables 내용으로 비교
+pdf_to_markdown / pptx_to_markdown 의 원본 헤더(## 📄 Page N, ## 🖼 Slide N)를 기준으로 동작하므로
+refine_extracted_markdown 보다 먼저 적용해야 합니다.
+"""
+
+import hashlib
+import json
+import re
+from typing import Any
+
+from app.extract_constants import TABLE_BLOCK_PATTERN, TABLE_REF_PREFIX
+
+# 페이지/슬라이드 구간 헤더 (pdf_utils / pptx_utils 출력 형식)
+SECTION_HEADER_PATTERN = re.compile(
+    r"^##\s*(?:📄|🖼)\s*(Page|Slide)\s+(\d+)(?:\s*:\s*(.*?))?\s*$",
+    re.MULTILINE,
+)
+
+SIMHASH_BITS = 64
+# 64bit 를 16bit 밴드 4개로 나눔: 해밍 거리 3 이하면 최소 한 밴드가 일치 (비둘기집 원리)
+SIMHASH_BANDS = 4
+SHINGLE_SIZE = 3
+# 본문 근사 중복 판정 해밍 거리
+BODY_MAX_DISTANCE = 3
+# 본문 근사 중복 확정용 숫자 토큰 (하나라도 다르면 다른 본문으로 취급)
+NUMBER_TOKEN_PATTERN = re.compile(r"\d+(?:[.,]\d+)*")
+# 이보다 짧은 본문/표는 역참조가 더 길거나 오탐 위험이 커서 건너뜀
+MIN_DEDUP_CHARS = 48
+
+# 역참조 문구 접두어 (md_refine 의 반복 푸터 제거 대상에서 제외하는 데 사용)
+DEDUP_REF_PREFIX = "_(동일 "
+
+# 토큰 수 추정: UTF-8 바이트 4개 ≈ 1 토큰 (한글 1자 ≈ 0.75 토큰)
+BYTES_PER_TOKEN_ESTIMATE = 4
+
+
+def _shingles(text: str, k: int = SHINGLE_SIZE) -> set[str]:
+    """공백 기준 단어 k-gram 집합."""
+    words = text.split()
+    if len(words) < k:
+        return {" ".join(words)} if words else set()
+    return {" ".join(words[i:i + k]) for i in range(len(words) - k + 1)}
+
+
+# 바이트 값 → k 번째 비트(0/1) 변환 테이블. simhash 가 비트별 1 개수를 bytes.translate/count (C 루프)로 셈
+_BIT_TABLES = [bytes((b >> k) & 1 for b in range(256)) for k in range(8)]
+_SIMHASH_BYTES = SIMHASH_BITS // 8
+
+
+def simhash(text: str) -> int:
+    """
+    단어 shingle 집합의 64bit SimHash.
+    shingle 해시를 한 bytes 로 이어 붙인 뒤 바이트 자리별 열을 잘라 비트마다 1 개수를 세므로
+    shingle 수와 무관하게 Python 반복은 64회.
+    """
+    shingles = _shingles(text)
+    if not shingles:
+        return 0
+    digests = b"".join(
+        hashlib.blake2b(shingle.encode("utf-8"), digest_size=_SIMHASH_BYTES).digest() for shingle in shingles
+    )
+    half = len(shingles) / 2
+    value = 0
+    for pos in range(_SIMHASH_BYTES):
+        column = digests[pos::_SIMHASH_BYTES]
+        shift = (_SIMHASH_BYTES - 1 - pos) * 8  # 다이제스트는 big-endian 정수로 해석
+        for bit, table in enumerate(_BIT_TABLES):
+            if column.translate(table).count(1) > half:
+                value |= 1 << (shift + bit)
+    return value
+
+
+class _SimHashIndex:
+    """밴드별 dict 로 후보를 찾는 SimHash 인덱스. 삽입·조회 모두 O(밴드 수)."""
+
+    def __init__(self, max_distance: int):
+        self.max_distance = max_distance
+        self.band_bits = SIMHASH_BITS // SIMHASH_BANDS
+        self.band_mask = (1 << self.band_bits) - 1
+        self.bands: list[dict[int, list[tuple[int, str]]]] = [{} for _ in range(SIMHASH_BANDS)]
+
+    def _band_keys(self, value: int) -> list[int]:
+        return [(value >> (i * self.band_bits)) & self.band_mask for i in range(SIMHASH_BANDS)]
+
+    def find(self, value: int) -> list[str]:
+        """해밍 거리 max_distance 이하인 항목의 라벨 (먼저 추가된 순)."""
+        found: dict[str, int] = {}
+        for band, key in zip(self.bands, self._band_keys(value)):
+            for order, (other, label) in enumerate(band.get(key, ())):
+                if label not in found and bin(value ^ other).count("1") <= self.max_distance:
+                    found[label] = order
+        return sorted(found, key=found.__getitem__)
+
+    def add(self, value: int, label: str) -> None:
+        for band, key in zip(self.bands, self._band_keys(value)):
+            band.setdefault(key, []).append((value, label))
+
+
+def _split_body(body: str) -> tuple[str, str, str]:
+    """구간 본문을 (앞 공백, 핵심 본문, 끝 구분선(---)·공백) 으로 나눔."""
+    lead_len = len(body) - len(body.lstrip())
+    core = body[lead_len:].rstrip()
+    while core.endswith("---"):
+        core = core[:-3].rstrip()
+    return body[:lead_len], core, body[lead_len + len(core):]
+
+
+def _number_tokens(text: str) -> tuple[str, ...]:
+    """본문의 숫자 토큰 multiset (정렬 튜플). SimHash 후보 확인용."""
+    return tuple(sorted(NUMBER_TOKEN_PATTERN.findall(text)))
+
+
+def table_digest(table: str) -> str:
+    """공백을 정규화한 표 텍스트의 blake2b 다이제스트 (완전 일치 비교용)."""
+    return hashlib.blake2b(" ".join(table.split()).encode("utf-8"), digest_size=16).hexdigest()
+
+
+def _dedup_tables(body: str, seen: dict[str, str], label: str, stats: dict[str, int]) -> str:
+    """본문 안의 [[TABLE]] 블록 중 이전에 나온 표(다이제스트 일치)는 역참조로 교체."""
+    def repl(m: re.Match) -> str:
+        table = m.group(1)
+        if len(table) < MIN_DEDUP_CHARS:
+            return m.group(0)
+        digest = table_digest(table)
+        first = seen.get(digest)
+        if first is None:
+            seen[digest] = label
+            return m.group(0)
+        stats["tables_deduped"] += 1
+        return f"{DEDUP_REF_PREFIX}표: {first})_"
+
+    return TABLE_BLOCK_PATTERN.sub(repl, body)
+
+
+def _dedup_json_tables(
+    tables: list[dict[str, Any]],
+    stats: dict[str, int],
+    ref_digests: dict[str, str],
+) -> int:
+    """
+    table_format=json 의 meta.tables 에서 내용(header·columns)이 완전히 같은 표는
+    {"index", 위치, "same_as": 첫 표 index} 로 교체. 반환: 절감 바이트 수(JSON 직렬화 기준).
+    ref_digests 에는 {"table_ref: N": 표 내용 다이제스트} 를 채워 본문 중복 비교에 사용.
+    """
+    seen: dict[str, int] = {}
+    saved = 0
+    for i, table in enumerate(tables):
+        if "header" not in table:
+            continue
+        body = json.dumps([table["header"], table["columns"]], ensure_ascii=False)
+        digest = hashlib.blake2b(body.encode("utf-8"), digest_size=16).hexdigest()
+        ref_digests[f"{TABLE_REF_PREFIX}{table['index']}"] = digest
+        first = seen.get(digest)
+        if first is None:
+            seen[digest] = table["index"]
+            continue
+        before = len(json.dumps(table, ensure_ascii=False).encode("utf-8"))
+        ref = {k: v for k, v in table.items() if k not in ("header", "columns")}
+        ref["same_as"] = first
+        tables[i] = ref
+        saved += before - len(json.dumps(ref, ensure_ascii=False).encode("utf-8"))
+        stats["tables_deduped"] += 1
+    return saved
+
+
+def dedup_sections(markdown: str, out_meta: dict[str, Any] | None = None) -> str:
+    """
+    페이지/슬라이드 본문과 표의 (유사) 중복을 첫 등장만 남기고 역참조로 교체.
+    - 표를 뺀 본문이 앞 구간과 근사 중복이고 숫자 토큰·표도 모두 같으면 본문을 "_(동일 내용: Slide N)_" 로 교체
+    - 그렇지 않으면 본문 안의 [[TABLE]] 블록만 개별적으로 중복 검사
+    - out_meta["tables"](table_format=json) 가 있으면 내용이 같은 표를 "same_as" 참조로 교체
+    - out_meta 가 주어지면 out_meta["dedup"] 에 교체 개수와 절감 바이트/추정 토큰을 채움.
+    """
+    stats = {"sections_deduped": 0, "tables_deduped": 0}
+    json_bytes_saved = 0
+    ref_digests: dict[str, str] = {}
+    if out_meta is not None and out_meta.get("tables"):
+        json_bytes_saved = _dedup_json_tables(out_meta["tables"], stats, ref_digests)
+
+    headers = list(SECTION_HEADER_PATTERN.finditer(markdown))
+    result = _dedup_markdown_sections(markdown, headers, stats, ref_digests) if headers else markdown
+
+    if out_meta is not None:
+        bytes_saved = len(markdown.encode("utf-8")) - len(result.encode("utf-8")) + json_bytes_saved
+        out_meta["dedup"] = {
+            **stats,
+            "bytes_saved": bytes_saved,
+            "tokens_saved_est": bytes_saved // BYTES_PER_TOKEN_ESTIMATE,
+        }
+
+    return result
+
+
+def _dedup_markdown_sections(
+    markdown: str,
+    headers: list[re.Match],
+    stats: dict[str, int],
+    ref_digests: dict[str, str],
+) -> str:
+    """
+    dedup_sections 의 마크다운 본문·[[TABLE]] 처리부.
+    ref_digests: json 표 블록("table_ref: N")의 참조 표 내용 다이제스트 (_dedup_json_tables 가 채움).
+    """
+    body_index = _SimHashIndex(BODY_MAX_DISTANCE)
+    # 라벨 → (표 다이제스트 목록, 숫자 토큰): SimHash 후보를 중복으로 확정할 때 비교
+    body_keys: dict[str, tuple[list[str], tuple[str, ...]]] = {}
+    seen_tables: dict[str, str] = {}
+
+    parts: list[str] = [markdown[:headers[0].start()]]
+    for i, header in enumerate(headers):
+        end = headers[i + 1].start() if i + 1 < len(headers) else len(markdown)
+        kind, number, title = header.group(1), header.group(2), header.group(3)
+        label = f"{kind} {number}" + (f" ({title})" if title else "")
+        body = markdown[header.end():end]
+        lead, core, tail = _split_body(body)
+
+        text_only = TABLE_BLOCK_PATTERN.sub("", core)
+        if len(text_only.strip()) >= MIN_DEDUP_CHARS:
+            digests = [
+                ref_digests.get(m.group(1)) or table_digest(m.group(1))
+                for m in TABLE_BLOCK_PATTERN.finditer(core)
+            ]
+            keys = (digests, _number_tokens(text_only))
+            value = simhash(text_only)
+            first = next((c for c in body_index.find(value) if body_keys[c] == keys), None)
+            if first is not None:
+                stats["sections_deduped"] += 1
+                parts.append(header.group(0) + lead + f"{DEDUP_REF_PREFIX}내용: {first})_" + tail)
+                continue
+            body_index.add(value, label)
+            body_keys[label] = keys
+
+        core = _dedup_tables(core, seen_tables, label, stats)
+        parts.append(header.group(0) + lead + core + tail)
+
+    return "".join(parts)
@@ -1,11 +1,31 @@
 """
 추출 MD 내 표/다이어그램 블록 구분자.
 보고서 생성 시 이 구분자를 인식해 HTML <table> 또는 다이어그램 영역으로 렌더링할 수 있음.
+표 본문 인코딩(table_format): markdown(기본, | ... | 테이블) / csv(압축) / json(meta.tables 에 열 배열로 분리).
 """
 
+import csv
+import io
+import re
+from typing import Any
+
 # 표 블록: [[TABLE]] ... [[/TABLE]] 사이는 마크다운 테이블(| ... |) 또는 CSV 성격의 텍스트.
 BLOCK_TABLE_START = "[[TABLE]]"
 BLOCK_TABLE_END = "[[/TABLE]]"
+# 표 블록 전체 매치 (group(1) = 표 본문)
+TABLE_BLOCK_PATTERN = re.compile(
+    re.escape(BLOCK_TABLE_START) + r"\n(.*?)\n" + re.escape(BLOCK_TABLE_END),
+    re.DOTALL,
+)
+
+# 표 본문 인코딩
+TABLE_FORMAT_MARKDOWN = "markdown"
+TABLE_FORMAT_CSV = "csv"
+TABLE_FORMAT_JSON = "json"
+TABLE_FORMATS = (TABLE_FORMAT_MARKDOWN, TABLE_FORMAT_CSV, TABLE_FORMAT_JSON)
+
+# table_format=json 일 때 표 블록 본문: "table_ref: <meta.tables 인덱스>"
+TABLE_REF_PREFIX = "table_ref: "
 
 # 다이어그램 블록: [[DIAGRAM]] ... [[/DIAGRAM]] 사이는 차트/플로우 등 설명 또는 캡션.
 BLOCK_DIAGRAM_START = "[[DIAGRAM]]"
@@ -24,3 +44,53 @@ def wrap_diagram(description_or_caption: str) -> str:
     if not description_or_caption.strip():
         return ""
     return f"{BLOCK_DIAGRAM_START}\n{description_or_caption.strip()}\n{BLOCK_DIAGRAM_END}"
+
+
+def render_table(rows: list[list[str]], table_format: str = TABLE_FORMAT_MARKDOWN) -> str:
+    """
+    표 행 리스트(첫 행 = 헤더)를 markdown 또는 csv 문자열로 변환.
+    csv 는 패딩·구분선 없이 필요한 셀만 따옴표로 감싸 markdown 대비 크기가 작음.
+    """
+    if not rows or not rows[0]:
+        return ""
+    if table_format == TABLE_FORMAT_CSV:
+        buf = io.StringIO()
+        csv.writer(buf, lineterminator="\n").writerows(rows)
+        return buf.getvalue().rstrip("\n")
+
+    header = rows[0]
+    lines = [
+        "| " + " | ".join(header) + " |",
+        "| " + " | ".join(["---"] * len(header)) + " |",
+    ]
+    for row in rows[1:]:
+        lines.append("| " + " | ".join(row) + " |")
+    return "\n".join(lines)
+
+
+def table_to_columns(rows: list[list[str]]) -> dict[str, Any]:
+    """표 행 리스트를 {"header": [...], "columns": [[열1 값...], ...]} 열 배열 형태로 변환."""
+    header = rows[0] if rows else []
+    width = max((len(row) for row in rows), default=0)
+    columns = [[row[i] if i < len(row) else "" for row in rows[1:]] for i in range(width)]
+    return {"header": header, "columns": columns}
+
+
+def wrap_table_rows(
+    rows: list[list[str]],
+    table_format: str = TABLE_FORMAT_MARKDOWN,
+    tables_out: list[dict[str, Any]] | None = None,
+    **location: Any,
+) -> str:
+    """
+    표 행 리스트를 table_format 에 맞춰 [[TABLE]] 블록으로 감싼다.
+    json 이면 표 본문은 tables_out 에 열 배열로 추가하고(location 은 page/slide 등 위치 정보),
+    블록에는 "table_ref: <tables_out 인덱스>" 만 남긴다. (dedup 시 중복 표는 "same_as" 참조로,
+    정규화 시 셀 값도 markdown/csv 와 동일하게 정규화됨 — app/dedup.py, app/pipeline.py)
+    """
+    if not rows or not rows[0]:
+        return ""
+    if table_format == TABLE_FORMAT_JSON and tables_out is not None:
+        tables_out.append({"index": len(tables_out), **location, **table_to_columns(rows)})
+        return wrap_table(f"{TABLE_REF_PREFIX}{len(tables_out) - 1}")
+    return wrap_table(render_table(rows, table_format))
@@ -0,0 +1,150 @@
+"""
+app/image_ocr.py
+이미지 blob OCR 유틸리티 (PPTX 그림 도형용, pytesseract 선택 의존).
+- 이미지 blob SHA-1 으로 중복을 제거해 같은 이미지는 한 번만 OCR
+- 결과는 디스크 캐시(OCR_CACHE_DIR/<sha1>.txt)에 저장해 재업로드·템플릿 덱에서 재사용.
+  캐시는 OCR_CACHE_MAX_MB 를 넘으면 오래 사용하지 않은 항목부터 삭제 (읽을 때 mtime 갱신 = LRU)
+- 캐시에 없는 이미지만 스레드 풀에서 병렬 OCR (tesseract 는 외부 프로세스라 GIL 영향 없음)
+"""
+
+import hashlib
+import io
+import logging
+import os
+import tempfile
+import time
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+
+logger = logging.getLogger(__name__)
+
+# OCR 결과 디스크 캐시 디렉토리 (요청 간 공유)
+OCR_CACHE_DIR = Path(os.environ.get("OCR_CACHE_DIR") or Path(tempfile.gettempdir()) / "docmaster_ocr_cache")
+
+# 디스크 캐시 최대 크기(MB). 초과 시 최근에 쓰이지 않은 항목부터 삭제
+OCR_CACHE_MAX_MB = float(os.environ.get("OCR_CACHE_MAX_MB", "200"))
+# 캐시 정리 최소 간격(초, 프로세스별)
+OCR_CACHE_PRUNE_INTERVAL = 300
+
+# 병렬 OCR 워커 수
+OCR_WORKERS = int(os.environ.get("OCR_WORKERS", "0")) or min(4, os.cpu_count() or 1)
+
+# pytesseract + PIL 선택 사용 (미설치 시 OCR 결과는 항상 빈 문자열). PDF OCR(app/pdf_utils.py)도 같은 확인 결과 사용
+_ocr_available: bool | None = None
+
+_last_prune: float = 0.0
+
+
+def blob_sha1(blob: bytes) -> str:
+    """이미지 blob 의 SHA-1 hex."""
+    return hashlib.sha1(blob).hexdigest()
+
+
+def is_ocr_available() -> bool:
+    """pytesseract / PIL 임포트 가능 여부 (최초 1회 확인 후 캐시)."""
+    global _ocr_available
+    if _ocr_available is None:
+        try:
+            import pytesseract  # noqa: F401
+            from PIL import Image  # noqa: F401
+            _ocr_available = True
+        except ImportError as e:
+            logger.debug("OCR 비활성화(의존성 없음): %s", e)
+            _ocr_available = False
+    return _ocr_available
+
+
+def _ocr_blob(blob: bytes) -> str | None:
+    """blob 하나 OCR. 실패 시 None (캐시하지 않음)."""
+    try:
+        from PIL import Image
+        import pytesseract
+
+        with Image.open(io.BytesIO(blob)) as img:
+            text = pytesseract.image_to_string(img.convert("RGB"), lang="kor+eng")
+        return (text or "").strip()
+    except Exception as e:
+        logger.warning("이미지 OCR 실패: %s", e)
+        return None
+
+
+def _read_cache(sha1: str) -> str | None:
+    path = OCR_CACHE_DIR / f"{sha1}.txt"
+    try:
+        text = path.read_text(encoding="utf-8")
+        os.utime(path)  # LRU 정리용 사용 시각 갱신
+        return text
+    except OSError:
+        return None
+
+
+def prune_cache(max_bytes: int | None = None) -> int:
+    """캐시가 max_bytes 를 넘으면 mtime 이 오래된 항목부터 삭제. 반환: 삭제한 파일 수."""
+    if max_bytes is None:
+        max_bytes = int(OCR_CACHE_MAX_MB * 1024 * 1024)
+    entries = []
+    try:
+        for path in OCR_CACHE_DIR.glob("*.txt"):
+            st = path.stat()
+            entries.append((st.st_mtime, st.st_size, path))
+    except OSError:
+        return 0
+    total = sum(size for _, size, _ in entries)
+    removed = 0
+    for _, size, path in sorted(entries):
+        if total <= max_bytes:
+            break
+        try:
+            path.unlink()
+        except OSError:
+            continue
+        total -= size
+        removed += 1
+    return removed
+
+
+def _write_cache(sha1: str, text: str) -> None:
+    try:
+        OCR_CACHE_DIR.mkdir(parents=True, exist_ok=True)
+        # 동시 요청이 같은 파일을 쓰더라도 반쯤 쓰인 파일을 읽지 않도록 임시 파일 후 교체
+        tmp_path = OCR_CACHE_DIR / f"{sha1}.{os.getpid()}.tmp"
+        tmp_path.write_text(text, encoding="utf-8")
+        os.replace(tmp_path, OCR_CACHE_DIR / f"{sha1}.txt")
+    except OSError as e:
+        logger.warning("OCR 캐시 저장 실패 (%s): %s", sha1, e)
+
+
+def ocr_blobs(blobs: dict[str, bytes], stats: dict[str, int] | None = None) -> dict[str, str]:
+    """
+    {sha1: blob} 를 OCR 해 {sha1: 텍스트} 로 반환.
+    디스크 캐시에 있으면 재사용하고, 없는 것만 스레드 풀에서 OCR 후 캐시에 저장.
+    stats 가 주어지면 cache_hits, ocr_runs 를 누적.
+    """
+    results: dict[str, str] = {}
+    pending: dict[str, bytes] = {}
+    for sha1, blob in blobs.items():
+        cached = _read_cache(sha1)
+        if cached is not None:
+            results[sha1] = cached
+        else:
+            pending[sha1] = blob
+
+    if stats is not None:
+        stats["cache_hits"] = stats.get("cache_hits", 0) + len(results)
+
+    if pending and is_ocr_available():
+        with ThreadPoolExecutor(max_workers=min(OCR_WORKERS, len(pending))) as pool:
+            for sha1, text in zip(pending, pool.map(_ocr_blob, pending.values())):
+                if text is None:
+                    continue
+                results[sha1] = text
+                _write_cache(sha1, text)
+        if stats is not None:
+            stats["ocr_runs"] = stats.get("ocr_runs", 0) + len(pending)
+
+        global _last_prune
+        if time.monotonic() - _last_prune >= OCR_CACHE_PRUNE_INTERVAL:
+            _last_prune = time.monotonic()
+            prune_cache()
+
+    return results
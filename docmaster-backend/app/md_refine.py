@@ -9,6 +9,8 @@ PDF/PPTX 추출 직후 적용하여 슬라이드 잔재, 반복 푸터, 빈 불
 import re
 from typing import List
 
+from app.dedup import DEDUP_REF_PREFIX
+
 
 def _normalize_slide_headers(text: str) -> str:
     """## 🖼 Slide N: - N - → ## Slide N, ## 🖼 Slide N: 제목 → ## 제목"""
@@ -51,8 +53,11 @@ def _remove_empty_bullets(text: str) -> str:
 
 
 def _find_repeated_footer_candidates(text: str, min_occurrences: int = 3) -> set:
-    """문서 전역에서 min_occurrences회 이상 나오는 줄을 푸터 후보로 반환."""
-    lines = [ln.strip() for ln in text.split("\n") if ln.strip()]
+    """문서 전역에서 min_occurrences회 이상 나오는 줄을 푸터 후보로 반환. 중복 제거 역참조 줄은 제외."""
+    lines = [
+        ln.strip() for ln in text.split("\n")
+        if ln.strip() and not ln.strip().startswith(DEDUP_REF_PREFIX)
+    ]
     from collections import Counter
 
     counts = Counter(lines)
@@ -3,132 +3,248 @@ app/pdf_utils.py
 PDF 파일을 마크다운으로 변환하는 유틸리티 모듈.
 - pymupdf4llm : 본문 텍스트 → LLM/RAG용 마크다운 변환
 - pdfplumber  : 표(테이블) 추출 → 마크다운 테이블 형식으로 병합
+- 페이지 분류기: 텍스트 레이어 글자 수·이미지 점유율·폰트 유무로 페이지를 native/ocr/hybrid 로 라우팅
+  (스캔 페이지는 pymupdf4llm·pdfplumber 를 건너뛰고 바로 OCR)
 - OCR fallback: 페이지 텍스트가 비었을 때만 해당 페이지에 OCR 적용 (pytesseract 선택 의존)
 - 표 블록은 [[TABLE]]...[[/TABLE]] 구분자로 감싸 보고서 생성 시 표로 렌더 가능하도록 함.
 """
 
 import logging
 from pathlib import Path
-from typing import Any
+from typing import Any, Iterable
 
+import pymupdf
 import pymupdf4llm
 import pdfplumber
 
-from app.extract_constants import wrap_table
+from app.extract_constants import TABLE_FORMAT_JSON, TABLE_FORMAT_MARKDOWN, render_table, wrap_table_rows
+from app.image_ocr import is_ocr_available
 
 logger = logging.getLogger(__name__)
 
-# OCR fallback: pytesseract + PIL 선택 사용 (미설치 시 빈 페이지는 그대로 둠)
-_ocr_available: bool | None = None
-
-def _ocr_page_fallback(pdf_path: str, page_index_0: int, dpi: int = 300) -> str:
-    """해당 PDF 페이지를 이미지로 렌더 후 OCR. 실패 시 빈 문자열."""
-    global _ocr_available
-    if _ocr_available is False:
-        return ""
-    try:
-        if _ocr_available is None:
-            import pytesseract  # noqa: F401
-            from PIL import Image
-            import pymupdf
-            _ocr_available = True
-    except ImportError as e:
-        logger.debug("OCR fallback 비활성화(의존성 없음): %s", e)
-        _ocr_available = False
+# 페이지 분류기 기준값
+# - 텍스트 레이어 글자 수가 이 값 미만이고 이미지가 페이지 대부분을 덮으면 스캔 페이지(ocr)로 간주
+SCANNED_MAX_TEXT_CHARS = 20
+SCANNED_MIN_IMAGE_COVERAGE = 0.6
+# - 텍스트가 조금 있지만 이미지 점유율이 높으면 hybrid (본문 추출 + 이미지 영역 OCR)
+HYBRID_MAX_TEXT_CHARS = 200
+HYBRID_MIN_IMAGE_COVERAGE = 0.3
+
+PAGE_ROUTE_NATIVE = "native"
+PAGE_ROUTE_OCR = "ocr"
+PAGE_ROUTE_HYBRID = "hybrid"
+
+
+def _ocr_page_fallback(
+    pdf_path: str,
+    page_index_0: int,
+    dpi: int = 300,
+    clips: list[tuple[float, float, float, float]] | None = None,
+) -> str:
+    """
+    해당 PDF 페이지를 이미지로 렌더 후 OCR. 실패 시 빈 문자열.
+    clips 가 주어지면 페이지 전체 대신 해당 영역(이미지 bbox)만 렌더해 OCR.
+    """
+    if not is_ocr_available():
         return ""
 
     try:
-        import pymupdf  # pymupdf4llm 의존성으로 이미 설치됨
         from PIL import Image
         import pytesseract
 
         doc = pymupdf.open(pdf_path)
         page = doc[page_index_0]
-        pix = page.get_pixmap(dpi=dpi, alpha=False)
-        img = Image.frombytes("RGB", [pix.width, pix.height], pix.samples)
+        texts: list[str] = []
+        for clip in clips or [None]:
+            pix = page.get_pixmap(dpi=dpi, alpha=False, clip=clip)
+            img = Image.frombytes("RGB", [pix.width, pix.height], pix.samples)
+            text = pytesseract.image_to_string(img, lang="kor+eng")
+            if text and text.strip():
+                texts.append(text.strip())
         doc.close()
-        text = pytesseract.image_to_string(img, lang="kor+eng")
-        return (text or "").strip()
+        return "\n\n".join(texts)
     except Exception as e:
         logger.warning("OCR fallback 실패 (page %s): %s", page_index_0 + 1, e)
         return ""
 
 
-def extract_tables_from_pdf(pdf_path: str) -> dict[int, list[str]]:
-    """pdfplumber로 페이지별 표를 추출해 마크다운 테이블 문자열 리스트로 반환."""
-    tables_by_page: dict[int, list[str]] = {}
+def _image_rects(page) -> list[tuple[float, float, float, float]]:
+    """페이지에 배치된 이미지 bbox 목록(페이지 영역으로 잘라냄)."""
+    rects: list[tuple[float, float, float, float]] = []
+    for info in page.get_image_info():
+        rect = pymupdf.Rect(info.get("bbox", (0, 0, 0, 0))) & page.rect
+        if not rect.is_empty:
+            rects.append(tuple(rect))
+    return rects
+
+
+def classify_pdf_pages(pdf_path: str) -> list[dict[str, Any]]:
+    """
+    레이아웃 분석 없이 페이지별 특징(텍스트 레이어 글자 수, 이미지 점유율, 폰트 유무)만 보고
+    native / ocr / hybrid 경로를 결정한다.
+    - ocr    : 텍스트 레이어가 없음, 또는 (OCR 사용 가능할 때만) 글자가 거의 없고 이미지가 페이지를 덮거나
+               폰트가 없음 → OCR 만 수행. OCR 결과가 비면 text_layer 로 대체.
+    - hybrid : 텍스트가 조금 있고 이미지 점유율이 높음 → 본문 추출 + 이미지 영역 OCR
+    - native : 그 외 → 기존 본문/표 추출 (OCR 미설치 시 스캔처럼 보이는 페이지도 여기로)
+    반환: [{"page": 1부터, "route", "text_chars", "image_coverage", "has_fonts", "image_rects", "text_layer"}, ...]
+    """
+    results: list[dict[str, Any]] = []
+    ocr_available = is_ocr_available()
+    with pymupdf.open(pdf_path) as doc:
+        for i, page in enumerate(doc):
+            text_layer = page.get_text("text").strip()
+            text_chars = len("".join(text_layer.split()))
+            has_fonts = bool(page.get_fonts())
+            rects = _image_rects(page)
+            page_area = abs(page.rect) or 1.0
+            # 겹치는 이미지는 과대평가될 수 있으므로 1.0 으로 제한
+            coverage = min(1.0, sum(abs(pymupdf.Rect(r)) for r in rects) / page_area)
+
+            looks_scanned = not has_fonts or (
+                text_chars < SCANNED_MAX_TEXT_CHARS and coverage >= SCANNED_MIN_IMAGE_COVERAGE
+            )
+            if text_chars == 0 or (ocr_available and looks_scanned):
+                route = PAGE_ROUTE_OCR
+            elif text_chars < HYBRID_MAX_TEXT_CHARS and coverage >= HYBRID_MIN_IMAGE_COVERAGE:
+                route = PAGE_ROUTE_HYBRID
+            else:
+                route = PAGE_ROUTE_NATIVE
+
+            results.append({
+                "page": i + 1,
+                "route": route,
+                "text_chars": text_chars,
+                "image_coverage": round(coverage, 3),
+                "has_fonts": has_fonts,
+                "image_rects": rects,
+                "text_layer": text_layer,
+            })
+    return results
+
+
+def extract_table_rows_from_pdf(pdf_path: str, pages: Iterable[int] | None = None) -> dict[int, list[list[str]]]:
+    """
+    pdfplumber로 페이지별 표를 추출해 행 리스트(첫 행 = 헤더)로 반환. 빈 셀(None)은 빈 문자열.
+    pages(1부터 시작하는 페이지 번호)가 주어지면 해당 페이지만 분석.
+    """
+    tables_by_page: dict[int, list[list[list[str]]]] = {}
 
     with pdfplumber.open(pdf_path) as pdf:
-        for page_num, page in enumerate(pdf.pages, start=1):
+        if pages is None:
+            selected = list(enumerate(pdf.pages, start=1))
+        else:
+            selected = [(n, pdf.pages[n - 1]) for n in sorted(set(pages)) if 1 <= n <= len(pdf.pages)]
+
+        for page_num, page in selected:
             raw_tables = page.extract_tables()
             if not raw_tables:
                 continue
 
-            md_tables: list[str] = []
-            for table in raw_tables:
-                if not table or not table[0]:
-                    continue
+            page_tables = [
+                [[str(cell or "") for cell in row] for row in table]
+                for table in raw_tables
+                if table and table[0]
+            ]
+            if page_tables:
+                tables_by_page[page_num] = page_tables
 
-                # 헤더 행
-                header = table[0]
-                header_row = "| " + " | ".join(str(cell or "") for cell in header) + " |"
-                separator = "| " + " | ".join(["---"] * len(header)) + " |"
-                rows = [header_row, separator]
-
-                # 데이터 행
-                for row in table[1:]:
-                    rows.append("| " + " | ".join(str(cell or "") for cell in row) + " |")
-
-                md_tables.append("\n".join(rows))
+    return tables_by_page
 
-            if md_tables:
-                tables_by_page[page_num] = md_tables
 
-    return tables_by_page
+def extract_tables_from_pdf(
+    pdf_path: str,
+    pages: Iterable[int] | None = None,
+    table_format: str = TABLE_FORMAT_MARKDOWN,
+) -> dict[int, list[str]]:
+    """
+    pdfplumber로 페이지별 표를 추출해 마크다운(또는 csv) 테이블 문자열 리스트로 반환.
+    외부 호출용 공개 함수로 유지 (pdf_to_markdown 은 json 형식 지원을 위해 extract_table_rows_from_pdf 를 직접 사용).
+    """
+    return {
+        page_num: [render_table(rows, table_format) for rows in tables]
+        for page_num, tables in extract_table_rows_from_pdf(pdf_path, pages).items()
+    }
 
 
-def pdf_to_markdown(pdf_path: str, out_meta: dict[str, Any] | None = None) -> str:
+def pdf_to_markdown(
+    pdf_path: str,
+    out_meta: dict[str, Any] | None = None,
+    table_format: str = TABLE_FORMAT_MARKDOWN,
+) -> str:
     """
     PDF 파일을 마크다운으로 변환.
-    - pymupdf4llm 으로 본문 추출
-    - 페이지 텍스트가 비었으면 OCR fallback 적용
-    - pdfplumber 로 표 추출 후 해당 페이지 마크다운에 병합
-    - out_meta 가 주어지면 page_count, ocr_pages 를 채움.
+    - classify_pdf_pages 로 페이지를 native / ocr / hybrid 로 먼저 분류
+    - native·hybrid 페이지만 pymupdf4llm 본문 추출 + pdfplumber 표 추출 (ocr 페이지는 건너뜀)
+    - ocr 페이지는 바로 OCR, hybrid 페이지는 이미지 영역 OCR 결과를 본문 뒤에 덧붙임
+    - 본문 텍스트가 비었으면 OCR fallback 적용, OCR 결과도 비면 텍스트 레이어 사용
+    - table_format: 표 블록 인코딩 (markdown | csv | json). json 이면 표는 out_meta["tables"] 에 열 배열로 담김.
+    - out_meta 가 주어지면 page_count, ocr_pages, page_routes 를 채움.
     """
-    # 1) 본문 마크다운 추출 (페이지별)
-    pages_md: list[dict] = pymupdf4llm.to_markdown(pdf_path, page_chunks=True)
-
-    # 2) 표 추출
-    tables_by_page = extract_tables_from_pdf(pdf_path)
+    # 1) 페이지 분류 (텍스트 레이어·이미지 점유율·폰트 유무)
+    page_classes = classify_pdf_pages(pdf_path)
+    text_page_nums = [c["page"] for c in page_classes if c["route"] != PAGE_ROUTE_OCR]
+
+    # 2) 본문 마크다운 추출 (native/hybrid 페이지만)
+    text_by_page: dict[int, str] = {}
+    if text_page_nums:
+        pages_md: list[dict] = pymupdf4llm.to_markdown(
+            pdf_path,
+            pages=[n - 1 for n in text_page_nums],
+            page_chunks=True,
+        )
+        for requested_num, page_info in zip(text_page_nums, pages_md):
+            metadata = page_info.get("metadata", {})
+            page_num = metadata.get("page") or metadata.get("page_number") or requested_num
+            text_by_page[page_num] = (page_info.get("text") or "").strip()
+
+    # 3) 표 추출 (native/hybrid 페이지만)
+    tables_by_page = extract_table_rows_from_pdf(pdf_path, pages=text_page_nums) if text_page_nums else {}
 
     ocr_pages: list[int] = []
+    tables_out: list[dict[str, Any]] = []
 
-    # 3) 병합 (빈 페이지는 OCR fallback)
+    # 4) 병합 (ocr 페이지·빈 페이지는 OCR, hybrid 페이지는 이미지 영역 OCR 추가)
     result_parts: list[str] = []
-    for i, page_info in enumerate(pages_md):
-        page_num: int = page_info.get("metadata", {}).get("page", i + 1)
-        page_text: str = (page_info.get("text") or "").strip()
-
-        if not page_text:
-            fallback = _ocr_page_fallback(pdf_path, i, dpi=300)
+    for page_class in page_classes:
+        page_num = page_class["page"]
+        route = page_class["route"]
+        page_text = text_by_page.get(page_num, "")
+
+        if route == PAGE_ROUTE_HYBRID and page_class["image_rects"]:
+            image_text = _ocr_page_fallback(pdf_path, page_num - 1, dpi=300, clips=page_class["image_rects"])
+            if image_text:
+                page_text = f"{page_text}\n\n{image_text}" if page_text else image_text
+                ocr_pages.append(page_num)
+                logger.info("이미지 영역 OCR 적용(hybrid): Page %s", page_num)
+        elif not page_text:
+            fallback = _ocr_page_fallback(pdf_path, page_num - 1, dpi=300)
             if fallback:
                 page_text = fallback
                 ocr_pages.append(page_num)
                 logger.info("OCR fallback 적용: Page %s", page_num)
+        if not page_text:
+            # 본문 추출·OCR 모두 비었으면(OCR 미설치·실패 포함) 분류 단계에서 읽은 텍스트 레이어라도 유지
+            page_text = page_class["text_layer"]
 
         result_parts.append(f"## 📄 Page {page_num}\n")
         result_parts.append(page_text)
 
         if page_num in tables_by_page:
             result_parts.append("\n\n### 📊 Tables\n")
-            for table_md in tables_by_page[page_num]:
-                result_parts.append(wrap_table(table_md))
+            for rows in tables_by_page[page_num]:
+                result_parts.append(wrap_table_rows(rows, table_format, tables_out, page=page_num))
                 result_parts.append("\n")
 
         result_parts.append("\n\n---\n\n")
 
     if out_meta is not None:
-        out_meta["page_count"] = len(pages_md)
+        out_meta["page_count"] = len(page_classes)
         out_meta["ocr_pages"] = ocr_pages
+        out_meta["page_routes"] = {
+            route: [c["page"] for c in page_classes if c["route"] == route]
+            for route in (PAGE_ROUTE_NATIVE, PAGE_ROUTE_OCR, PAGE_ROUTE_HYBRID)
+        }
+        if table_format == TABLE_FORMAT_JSON:
+            out_meta["tables"] = tables_out
 
     return "\n".join(result_parts)
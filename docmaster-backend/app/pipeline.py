@@ -0,0 +1,90 @@
+"""
+app/pipeline.py
+문서 1건 변환 파이프라인: 추출(PDF/PPTX) → 중복 제거 → 1차 정제 → 금액/날짜 정규화.
+API 서버(main.py)와 오프라인 일괄 변환 CLI(app/bulk_convert.py)가 함께 사용합니다.
+"""
+
+import csv
+import io
+
+from app.dedup import dedup_sections
+from app.extract_constants import (
+    TABLE_BLOCK_PATTERN,
+    TABLE_FORMAT_CSV,
+    TABLE_FORMAT_MARKDOWN,
+    render_table,
+    wrap_table,
+)
+from app.md_refine import refine_extracted_markdown
+from app.normalizer import apply_normalizations
+from app.pdf_utils import pdf_to_markdown
+from app.pptx_utils import pptx_to_markdown
+
+SUPPORTED_EXTENSIONS = {".pdf", ".pptx"}
+
+
+def _normalize_cell(cell: str) -> str:
+    """표 셀 하나에 금액/날짜 정규화 적용."""
+    return apply_normalizations(cell, normalize_amount=True, normalize_date=True)
+
+
+def _normalize_markdown(text: str, table_format: str) -> str:
+    """
+    마크다운 전체에 금액/날짜 정규화 적용.
+    csv 표 블록은 쉼표 구분자·행 줄바꿈이 금액 패턴에 섞이지 않도록 셀 단위로 정규화한 뒤 다시 인코딩.
+    """
+    if table_format != TABLE_FORMAT_CSV:
+        return apply_normalizations(text, normalize_amount=True, normalize_date=True)
+
+    parts: list[str] = []
+    pos = 0
+    for m in TABLE_BLOCK_PATTERN.finditer(text):
+        parts.append(apply_normalizations(text[pos:m.start()], normalize_amount=True, normalize_date=True))
+        rows = [[_normalize_cell(cell) for cell in row] for row in csv.reader(io.StringIO(m.group(1)))]
+        parts.append(wrap_table(render_table(rows, TABLE_FORMAT_CSV)))
+        pos = m.end()
+    parts.append(apply_normalizations(text[pos:], normalize_amount=True, normalize_date=True))
+    return "".join(parts)
+
+
+def convert_document(
+    path: str,
+    ext: str,
+    *,
+    refine: bool = True,
+    normalize: bool = True,
+    dedup: bool = False,
+    table_format: str = TABLE_FORMAT_MARKDOWN,
+    ocr_images: bool = False,
+) -> tuple[str, dict]:
+    """추출 → 중복 제거 → 정제 → 정규화 파이프라인. 반환: (마크다운, 메타)."""
+    parse_meta: dict = {}
+    if ext == ".pdf":
+        markdown_text = pdf_to_markdown(path, out_meta=parse_meta, table_format=table_format)
+    else:  # .pptx
+        markdown_text = pptx_to_markdown(
+            path, out_meta=parse_meta, table_format=table_format, ocr_images=ocr_images
+        )
+
+    # 반복 페이지/슬라이드·표 중복 제거 (원본 Page/Slide 헤더 기준이므로 정제 전에 수행)
+    if dedup:
+        markdown_text = dedup_sections(markdown_text, out_meta=parse_meta)
+
+    # 추출 MD 1차 정제 (슬라이드 잔재, 반복 푸터, 빈 불릿, 구분선 축소 등)
+    if refine:
+        markdown_text = refine_extracted_markdown(markdown_text)
+
+    # 금액/날짜 정규화 (보수적 적용)
+    if normalize:
+        markdown_text = _normalize_markdown(markdown_text, table_format)
+
+        # table_format=json 표 셀에도 같은 정규화 적용 (markdown/csv 와 셀 값 일치)
+        for table in parse_meta.get("tables", []):
+            if "header" not in table:
+                continue
+            table["header"] = [_normalize_cell(cell) for cell in table["header"]]
+            table["columns"] = [[_normalize_cell(cell) for cell in col] for col in table["columns"]]
+
+    # 메타: 표 개수 (최종 MD 기준)
+    parse_meta["table_count"] = markdown_text.count("[[TABLE]]")
+    return markdown_text, parse_meta
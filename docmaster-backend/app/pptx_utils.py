@@ -3,6 +3,8 @@ app/pptx_utils.py
 PPTX 파일에서 슬라이드별 텍스트·표·다이어그램(차트/SmartArt)을 추출하여 마크다운으로 변환하는 모듈.
 - 그룹 도형(GROUP) 내부를 재귀적으로 평탄화 후 top/left 순으로 정렬해 수집 (ssine/pptx2md 방식 참고).
 - 표는 [[TABLE]]...[[/TABLE]], 차트/다이어그램/SmartArt는 [[DIAGRAM]]...[[/DIAGRAM]] 구분자로 감싼다.
+- (선택) 그림 도형 OCR: blob SHA-1 로 중복 제거해 고유 이미지만 1회 OCR, 작은 이미지는 건너뜀.
+  OCR 텍스트는 첫 등장 위치에만 넣고, 여러 슬라이드에 반복되는 로고/배경 사본은 생략.
 """
 
 import logging
@@ -12,10 +14,23 @@ from pptx import Presentation
 from pptx.enum.shapes import MSO_SHAPE_TYPE
 from pptx.shapes.group import GroupShape
 
-from app.extract_constants import wrap_table, wrap_diagram
+from app.extract_constants import (
+    TABLE_FORMAT_JSON,
+    TABLE_FORMAT_MARKDOWN,
+    wrap_diagram,
+    wrap_table_rows,
+)
+from app.image_ocr import blob_sha1, ocr_blobs
 
 logger = logging.getLogger(__name__)
 
+# 그림 OCR 대상 최소 크기: blob 바이트 수, 픽셀 기준 짧은 변 (아이콘·불릿 이미지 제외)
+IMAGE_OCR_MIN_BYTES = 4 * 1024
+IMAGE_OCR_MIN_SIDE_PX = 100
+# 이 수 이상의 슬라이드에 반복되는 이미지는 로고/배경으로 보고 첫 등장 이후 사본은 출력하지 않음
+# (그보다 적게 반복되면 이후 사본은 첫 등장 슬라이드 역참조로 출력)
+IMAGE_OCR_REPEATED_MIN_SLIDES = 3
+
 
 def _flatten_shapes(shapes) -> list:
     """
@@ -37,16 +52,16 @@ def _flatten_shapes(shapes) -> list:
     return result
 
 
-def _shape_to_table_md(shape) -> str:
-    """shape.table 을 마크다운 테이블 문자열로 변환. 병합 셀은 빈 문자열로 처리."""
+def _shape_to_table_rows(shape) -> list[list[str]]:
+    """shape.table 을 행 리스트(첫 행 = 헤더)로 변환. 병합 셀은 빈 문자열로 처리."""
     try:
         tbl = shape.table
     except Exception as e:
         logger.warning("shape.table 접근 실패: %s", e)
-        return ""
+        return []
     if not tbl.rows:
-        return ""
-    rows_md: list[str] = []
+        return []
+    rows: list[list[str]] = []
     for row in tbl.rows:
         cells = []
         for cell in row.cells:
@@ -61,12 +76,8 @@ def _shape_to_table_md(shape) -> str:
                 except Exception:
                     text = ""
                 cells.append(text)
-        rows_md.append("| " + " | ".join(cells) + " |")
-    if not rows_md:
-        return ""
-    n_cols = len(tbl.rows[0].cells)
-    rows_md.insert(1, "| " + " | ".join(["---"] * n_cols) + " |")
-    return "\n".join(rows_md)
+        rows.append(cells)
+    return rows
 
 
 def _shape_to_diagram_caption(shape) -> str:
@@ -92,11 +103,42 @@ def _is_graphic_frame_diagram(shape) -> bool:
     return True
 
 
-def _collect_from_shapes(shapes, title_holder: list[str]) -> list[str]:
+def _picture_blob(shape) -> bytes | None:
+    """그림 도형(플레이스홀더 그림 포함)의 이미지 blob. 그림이 아니거나 읽기 실패 시 None."""
+    if getattr(shape, "shape_type", None) != MSO_SHAPE_TYPE.PICTURE and not hasattr(shape, "image"):
+        return None
+    try:
+        return shape.image.blob
+    except Exception:
+        return None
+
+
+def _is_small_image(shape, blob: bytes) -> bool:
+    """OCR 할 가치가 없을 만큼 작은 이미지인지 (바이트 수 또는 픽셀 크기 기준)."""
+    if len(blob) < IMAGE_OCR_MIN_BYTES:
+        return True
+    try:
+        width_px, height_px = shape.image.size
+    except Exception:
+        return False
+    return min(width_px, height_px) < IMAGE_OCR_MIN_SIDE_PX
+
+
+def _collect_from_shapes(
+    shapes,
+    title_holder: list[str],
+    table_format: str = TABLE_FORMAT_MARKDOWN,
+    tables_out: list[dict] | None = None,
+    slide_num: int | None = None,
+    picture_refs: list[tuple[int, str, bytes]] | None = None,
+) -> list[str]:
     """
     shapes(및 그룹 내부)에서 텍스트·표·차트·다이어그램을 수집.
     그룹은 평탄화한 뒤 top/left 순으로 정렬해 시각적 읽기 순서로 처리 (ssine/pptx2md 참고).
     title_holder[0] 에 제목 플레이스홀더 텍스트가 설정될 수 있음.
+    표는 table_format 으로 인코딩 (json 이면 tables_out 에 slide_num 과 함께 열 배열로 추가).
+    picture_refs 가 주어지면 그림 도형 자리에 빈 조각을 두고 (body_parts 인덱스, sha1, blob) 을 기록
+    (OCR 후 pptx_to_markdown 에서 채움). 너무 작은 이미지는 기록하지 않음.
     반환: body_parts (마크다운 조각 리스트)
     """
     flat = _flatten_shapes(shapes)
@@ -115,9 +157,11 @@ def _collect_from_shapes(shapes, title_holder: list[str]) -> list[str]:
             has_table = True
         if has_table:
             try:
-                table_md = _shape_to_table_md(shape)
-                if table_md:
-                    body_parts.append(wrap_table(table_md))
+                table_block = wrap_table_rows(
+                    _shape_to_table_rows(shape), table_format, tables_out, slide=slide_num
+                )
+                if table_block:
+                    body_parts.append(table_block)
             except Exception as e:
                 logger.warning("표 추출 실패(shape 건너뜀): %s", e)
             continue
@@ -133,6 +177,15 @@ def _collect_from_shapes(shapes, title_holder: list[str]) -> list[str]:
             body_parts.append(wrap_diagram("SmartArt/다이어그램"))
             continue
 
+        # 그림 (OCR 대상 수집)
+        if picture_refs is not None:
+            blob = _picture_blob(shape)
+            if blob is not None:
+                if not _is_small_image(shape, blob):
+                    picture_refs.append((len(body_parts), blob_sha1(blob), blob))
+                    body_parts.append("")
+                continue
+
         # 텍스트
         if not getattr(shape, "has_text_frame", False) or not shape.has_text_frame:
             continue
@@ -154,21 +207,71 @@ def _collect_from_shapes(shapes, title_holder: list[str]) -> list[str]:
     return body_parts
 
 
-def pptx_to_markdown(pptx_path: str, out_meta: dict | None = None) -> str:
+def pptx_to_markdown(
+    pptx_path: str,
+    out_meta: dict | None = None,
+    table_format: str = TABLE_FORMAT_MARKDOWN,
+    ocr_images: bool = False,
+) -> str:
     """
     PPTX 파일의 모든 슬라이드에서 텍스트·표·차트·SmartArt를 추출하여 마크다운으로 반환.
     - 그룹 도형 내부도 재귀 탐색하여 내용 수집.
     - 표: [[TABLE]]...[[/TABLE]], 차트/SmartArt: [[DIAGRAM]]...[[/DIAGRAM]]
-    - out_meta 가 주어지면 slide_count 를 채움.
+    - table_format: 표 블록 인코딩 (markdown | csv | json). json 이면 표는 out_meta["tables"] 에 열 배열로 담김.
+    - ocr_images: 그림 도형을 OCR 해 그 자리에 텍스트로 삽입 (고유 이미지만 1회, 디스크 캐시 사용).
+    - out_meta 가 주어지면 slide_count (및 ocr_images 시 image_ocr 통계) 를 채움.
     """
     prs = Presentation(pptx_path)
     result_parts: list[str] = []
+    tables_out: list[dict] = []
     slides = list(prs.slides)
 
+    # 1) 슬라이드별 수집 (그림은 자리만 잡아두고 blob 기록)
+    collected: list[tuple[str, list[str], list[tuple[int, str, bytes]]]] = []
     for slide_num, slide in enumerate(slides, start=1):
         title_holder: list[str] = [""]
-        body_parts = _collect_from_shapes(slide.shapes, title_holder)
-        title_text = title_holder[0]
+        picture_refs: list[tuple[int, str, bytes]] | None = [] if ocr_images else None
+        body_parts = _collect_from_shapes(
+            slide.shapes, title_holder, table_format, tables_out,
+            slide_num=slide_num, picture_refs=picture_refs,
+        )
+        collected.append((title_holder[0], body_parts, picture_refs or []))
+
+    # 2) 그림 OCR: 고유 blob 만 1회. 텍스트는 첫 등장 위치에 넣고 이후 사본은 역참조 또는 생략
+    if ocr_images:
+        slides_by_sha1: dict[str, set[int]] = {}
+        blobs: dict[str, bytes] = {}
+        for slide_idx, (_, _, refs) in enumerate(collected):
+            for _, sha1, blob in refs:
+                slides_by_sha1.setdefault(sha1, set()).add(slide_idx)
+                blobs[sha1] = blob
+        ocr_stats: dict[str, int] = {
+            "images": sum(len(refs) for _, _, refs in collected),
+            "unique_images": len(blobs),
+            "repeated_copies": 0,
+            "cache_hits": 0,
+            "ocr_runs": 0,
+        }
+        texts = ocr_blobs(blobs, stats=ocr_stats)
+        first_slide: dict[str, int] = {}
+        for slide_num, (_, body_parts, refs) in enumerate(collected, start=1):
+            for part_idx, sha1, _ in refs:
+                text = texts.get(sha1, "")
+                if not text:
+                    continue
+                if sha1 not in first_slide:
+                    first_slide[sha1] = slide_num
+                    body_parts[part_idx] = "_(이미지 OCR)_\n" + text
+                    continue
+                ocr_stats["repeated_copies"] += 1
+                if len(slides_by_sha1[sha1]) < IMAGE_OCR_REPEATED_MIN_SLIDES and first_slide[sha1] != slide_num:
+                    body_parts[part_idx] = f"_(이미지 OCR: Slide {first_slide[sha1]} 의 이미지와 동일)_"
+        if out_meta is not None:
+            out_meta["image_ocr"] = ocr_stats
+
+    # 3) 마크다운 조립
+    for slide_num, (title_text, body_parts, _) in enumerate(collected, start=1):
+        body_parts = [part for part in body_parts if part]
 
         slide_md = f"## 🖼 Slide {slide_num}"
         if title_text:
@@ -185,5 +288,7 @@ def pptx_to_markdown(pptx_path: str, out_meta: dict | None = None) -> str:
 
     if out_meta is not None:
         out_meta["slide_count"] = len(slides)
+        if table_format == TABLE_FORMAT_JSON:
+            out_meta["tables"] = tables_out
 
     return "\n".join(result_parts)
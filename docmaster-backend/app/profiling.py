@@ -0,0 +1,80 @@
+"""
+app/profiling.py
+요청 단위 파싱 파이프라인 프로파일링 유틸리티 (cProfile).
+
+관리자용 /api/parse?profile=1 요청을 cProfile 로 감싸 실행하고, 프로파일(.prof)만
+OUTPUTS_DIR 에 저장합니다 (고객 문서 내용인 변환 결과는 저장하지 않음).
+저장된 프로파일에서 파싱 모듈 (pdf_utils, pptx_utils, md_refine, normalizer, dedup) 의
+상위 N개 함수를 요약해 반환합니다.
+"""
+
+import cProfile
+import pstats
+import time
+from pathlib import Path
+from typing import Any, Callable, TypeVar
+
+T = TypeVar("T")
+
+# 요약 대상 파싱 모듈 파일명
+PROFILED_MODULES = ("pdf_utils.py", "pptx_utils.py", "md_refine.py", "normalizer.py", "dedup.py")
+
+PROFILE_SUFFIX = ".prof"
+
+SORT_KEYS = ("cumulative", "tottime", "ncalls")
+
+
+def run_profiled(func: Callable[..., T], *args: Any, **kwargs: Any) -> tuple[T, cProfile.Profile, float]:
+    """func 를 cProfile 로 감싸 실행. 반환: (결과, 프로파일러, 경과 초)."""
+    profiler = cProfile.Profile()
+    started = time.perf_counter()
+    profiler.enable()
+    try:
+        result = func(*args, **kwargs)
+    finally:
+        profiler.disable()
+    return result, profiler, time.perf_counter() - started
+
+
+def save_profile(profiler: cProfile.Profile, outputs_dir: Path, file_id: str) -> Path:
+    """프로파일을 outputs_dir/{file_id}.prof 로 저장하고 경로를 반환."""
+    path = outputs_dir / f"{file_id}{PROFILE_SUFFIX}"
+    profiler.dump_stats(str(path))
+    return path
+
+
+def top_functions(
+    profile_path: Path,
+    limit: int = 20,
+    sort: str = "cumulative",
+    modules: tuple[str, ...] = PROFILED_MODULES,
+) -> dict[str, Any]:
+    """
+    저장된 프로파일에서 파싱 모듈 함수만 골라 sort 기준 상위 limit 개를 반환.
+    sort: cumulative(누적 시간) | tottime(자체 시간) | ncalls(호출 수)
+    """
+    if sort not in SORT_KEYS:
+        raise ValueError(f"지원하지 않는 정렬 기준입니다: {sort}. {', '.join(SORT_KEYS)} 중 하나를 사용하세요.")
+
+    stats = pstats.Stats(str(profile_path))
+    rows: list[dict[str, Any]] = []
+    for (filename, lineno, func_name), (_, ncalls, tottime, cumtime, _) in stats.stats.items():
+        module = Path(filename).name
+        if module not in modules:
+            continue
+        rows.append({
+            "function": f"{module}:{lineno}({func_name})",
+            "module": module.removesuffix(".py"),
+            "ncalls": ncalls,
+            "tottime": round(tottime, 6),
+            "cumtime": round(cumtime, 6),
+        })
+
+    sort_field = {"cumulative": "cumtime", "tottime": "tottime", "ncalls": "ncalls"}[sort]
+    rows.sort(key=lambda row: row[sort_field], reverse=True)
+    return {
+        "total_calls": stats.total_calls,
+        "total_time": round(stats.total_tt, 6),
+        "sort": sort,
+        "functions": rows[:limit],
+    }
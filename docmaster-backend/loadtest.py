@@ -0,0 +1,341 @@
+"""
+loadtest.py
+DocMaster AI 파싱 서버 로컬 부하 테스트 도구 (비동기 부하 생성기).
+픽스처 코퍼스(PDF/PPTX)를 /api/parse 에 반복 업로드하며 처리량, 지연 시간(p50/p95/p99),
+오류·5xx 비율, 서버 RSS 추이를 측정해 JSON 으로 출력합니다.
+워커 수·풀 크기 등 배포 설정을 바꾸기 전에 로컬에서 비교하는 용도입니다.
+
+의존성: httpx (pip install httpx). RSS 측정은 psutil 이 있으면 사용, 없으면 /proc (Linux).
+
+실행 방법:
+  cd docmaster-backend
+  # uvicorn 을 직접 띄워 측정 (워커 수 비교)
+  python loadtest.py --corpus ./fixtures --start-server --workers 2 --concurrency 8 --requests 200 --json out.json
+  # 이미 떠 있는 서버에 도착률(초당 요청 수) 기준으로 부하
+  python loadtest.py --corpus ./fixtures --url http://127.0.0.1:8001 --server-pid 12345 --rate 5 --duration 60
+"""
+
+import argparse
+import asyncio
+import json
+import math
+import random
+import subprocess
+import sys
+import time
+from pathlib import Path
+from typing import Any
+
+SUPPORTED_EXTENSIONS = {".pdf", ".pptx"}
+
+CONTENT_TYPES = {
+    ".pdf": "application/pdf",
+    ".pptx": "application/vnd.openxmlformats-officedocument.presentationml.presentation",
+}
+
+
+def load_corpus(corpus_dir: Path) -> list[tuple[str, bytes]]:
+    """corpus_dir 아래 PDF/PPTX 파일을 (파일명, 바이트) 리스트로 읽음."""
+    files = sorted(
+        p for p in corpus_dir.rglob("*")
+        if p.is_file() and p.suffix.lower() in SUPPORTED_EXTENSIONS
+    )
+    return [(p.name, p.read_bytes()) for p in files]
+
+
+def _read_rss_bytes(pid: int) -> int:
+    """pid 와 자식 프로세스(uvicorn 워커)의 RSS 합계. 측정 불가 시 0."""
+    try:
+        import psutil
+    except ImportError:
+        psutil = None
+
+    if psutil is not None:
+        try:
+            proc = psutil.Process(pid)
+            procs = [proc] + proc.children(recursive=True)
+            return sum(p.memory_info().rss for p in procs if p.is_running())
+        except psutil.Error:
+            return 0
+
+    # psutil 미설치: /proc 에서 직접 읽음 (Linux 전용, 자식은 /proc/<pid>/task/*/children)
+    total = 0
+    pending = [pid]
+    while pending:
+        current = pending.pop()
+        try:
+            for line in Path(f"/proc/{current}/status").read_text().splitlines():
+                if line.startswith("VmRSS:"):
+                    total += int(line.split()[1]) * 1024
+                    break
+            for task in Path(f"/proc/{current}/task").iterdir():
+                children = (task / "children").read_text().split()
+                pending.extend(int(c) for c in children)
+        except (OSError, ValueError):
+            continue
+    return total
+
+
+def percentile(sorted_values: list[float], pct: float) -> float:
+    """정렬된 값에서 pct(0~100) 백분위수 (최근접 순위)."""
+    if not sorted_values:
+        return 0.0
+    rank = max(0, min(len(sorted_values) - 1, math.ceil(pct / 100 * len(sorted_values)) - 1))
+    return sorted_values[rank]
+
+
+async def _sample_rss(pid: int, interval: float, started: float, samples: list[dict], stop: asyncio.Event) -> None:
+    """stop 이 설정될 때까지 interval 초마다 서버 RSS 기록."""
+    while not stop.is_set():
+        rss = _read_rss_bytes(pid)
+        samples.append({"t": round(time.perf_counter() - started, 2), "rss_mb": round(rss / 1024 / 1024, 1)})
+        try:
+            await asyncio.wait_for(stop.wait(), timeout=interval)
+        except asyncio.TimeoutError:
+            pass
+
+
+async def _send_one(
+    client,
+    url: str,
+    item: tuple[str, bytes],
+    results: list[dict],
+    started: float,
+    scheduled_at: float | None = None,
+) -> None:
+    """
+    파일 하나 업로드 후 상태 코드·지연 시간 기록.
+    scheduled_at(예정 도착 시각)이 주어지면 지연 시간을 그때부터 측정해 대기열 시간도 포함
+    (open-loop 에서 과부하가 가려지는 coordinated omission 방지).
+    """
+    filename, content = item
+    ext = Path(filename).suffix.lower()
+    sent_at = time.perf_counter()
+    if scheduled_at is None:
+        scheduled_at = sent_at
+    record: dict[str, Any] = {
+        "file": filename,
+        "t": round(scheduled_at - started, 3),
+        "queue_wait": round(sent_at - scheduled_at, 4),
+    }
+    try:
+        resp = await client.post(url, files={"file": (filename, content, CONTENT_TYPES[ext])})
+        record["status"] = resp.status_code
+    except Exception as e:
+        record["status"] = 0
+        record["error"] = type(e).__name__
+    record["latency"] = time.perf_counter() - scheduled_at
+    results.append(record)
+
+
+async def run_load(
+    url: str,
+    corpus: list[tuple[str, bytes]],
+    *,
+    concurrency: int,
+    rate: float | None,
+    total_requests: int | None,
+    duration: float | None,
+    timeout: float,
+    server_pid: int | None,
+    rss_interval: float,
+) -> dict[str, Any]:
+    """
+    부하 실행.
+    - rate 미지정: 동시성 concurrency 의 closed-loop (응답 받으면 바로 다음 요청)
+    - rate 지정 : 초당 rate 건 포아송 도착 open-loop (동시 요청 상한 concurrency).
+                  지연 시간은 예정 도착 시각부터 측정 (상한 대기 시간 포함)
+    total_requests 또는 duration 중 먼저 도달하는 조건에서 종료.
+    """
+    import httpx
+
+    parse_url = url.rstrip("/") + "/api/parse"
+    results: list[dict] = []
+    rss_samples: list[dict] = []
+    stop = asyncio.Event()
+    started = time.perf_counter()
+    deadline = started + duration if duration else None
+
+    def should_continue(sent: int) -> bool:
+        if total_requests is not None and sent >= total_requests:
+            return False
+        if deadline is not None and time.perf_counter() >= deadline:
+            return False
+        return True
+
+    sampler = None
+    if server_pid:
+        sampler = asyncio.create_task(_sample_rss(server_pid, rss_interval, started, rss_samples, stop))
+
+    limits = httpx.Limits(max_connections=concurrency, max_keepalive_connections=concurrency)
+    async with httpx.AsyncClient(timeout=timeout, limits=limits) as client:
+        sent = 0
+        if rate is None:
+            async def worker() -> None:
+                nonlocal sent
+                while should_continue(sent):
+                    item = corpus[sent % len(corpus)]
+                    sent += 1
+                    await _send_one(client, parse_url, item, results, started)
+
+            await asyncio.gather(*(worker() for _ in range(concurrency)))
+        else:
+            semaphore = asyncio.Semaphore(concurrency)
+            in_flight: set[asyncio.Task] = set()
+
+            async def limited(item: tuple[str, bytes], scheduled_at: float) -> None:
+                async with semaphore:
+                    await _send_one(client, parse_url, item, results, started, scheduled_at)
+
+            while should_continue(sent):
+                task = asyncio.create_task(limited(corpus[sent % len(corpus)], time.perf_counter()))
+                in_flight.add(task)
+                task.add_done_callback(in_flight.discard)
+                sent += 1
+                await asyncio.sleep(random.expovariate(rate))
+            if in_flight:
+                await asyncio.gather(*in_flight)
+
+    elapsed = time.perf_counter() - started
+    stop.set()
+    if sampler is not None:
+        await sampler
+
+    return summarize(results, elapsed, rss_samples, concurrency=concurrency, rate=rate)
+
+
+def summarize(
+    results: list[dict],
+    elapsed: float,
+    rss_samples: list[dict],
+    *,
+    concurrency: int,
+    rate: float | None,
+) -> dict[str, Any]:
+    """요청 기록을 처리량·지연 백분위수·오류율 요약으로 변환."""
+    total = len(results)
+    latencies = sorted(r["latency"] for r in results)
+    ok = [r for r in results if 200 <= r["status"] < 300]
+    server_errors = [r for r in results if r["status"] >= 500]
+    status_counts: dict[str, int] = {}
+    for r in results:
+        key = str(r["status"]) if r["status"] else r.get("error", "error")
+        status_counts[key] = status_counts.get(key, 0) + 1
+
+    return {
+        "config": {"concurrency": concurrency, "rate": rate},
+        "requests": total,
+        "elapsed_sec": round(elapsed, 3),
+        "throughput_rps": round(len(ok) / elapsed, 3) if elapsed else 0.0,
+        "latency_sec": {
+            "mean": round(sum(latencies) / total, 4) if total else 0.0,
+            "p50": round(percentile(latencies, 50), 4),
+            "p95": round(percentile(latencies, 95), 4),
+            "p99": round(percentile(latencies, 99), 4),
+            "max": round(latencies[-1], 4) if latencies else 0.0,
+        },
+        "error_rate": round((total - len(ok)) / total, 4) if total else 0.0,
+        "server_error_rate": round(len(server_errors) / total, 4) if total else 0.0,
+        "status_counts": status_counts,
+        "rss_peak_mb": max((s["rss_mb"] for s in rss_samples), default=None),
+        "rss_samples": rss_samples,
+    }
+
+
+def start_server(port: int, workers: int) -> subprocess.Popen:
+    """이 디렉토리의 main:app 을 uvicorn 으로 띄움."""
+    cmd = [
+        sys.executable, "-m", "uvicorn", "main:app",
+        "--host", "127.0.0.1", "--port", str(port),
+        "--workers", str(workers), "--log-level", "warning",
+    ]
+    return subprocess.Popen(cmd, cwd=Path(__file__).parent)
+
+
+def wait_for_health(url: str, timeout: float = 30.0) -> None:
+    """/api/health 가 200 을 반환할 때까지 대기."""
+    import httpx
+
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        try:
+            if httpx.get(url.rstrip("/") + "/api/health", timeout=2.0).status_code == 200:
+                return
+        except httpx.HTTPError:
+            pass
+        time.sleep(0.3)
+    raise RuntimeError(f"서버가 {timeout}초 안에 응답하지 않습니다: {url}")
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(description="DocMaster 파싱 서버 부하 테스트")
+    parser.add_argument("--corpus", type=Path, required=True, help="PDF/PPTX 픽스처 디렉토리")
+    parser.add_argument("--url", default=None, help="대상 서버 URL (기본: http://127.0.0.1:<port>)")
+    parser.add_argument("--start-server", action="store_true", help="uvicorn main:app 을 직접 띄워 측정")
+    parser.add_argument("--port", type=int, default=8001)
+    parser.add_argument("--workers", type=int, default=1, help="--start-server 시 uvicorn 워커 수")
+    parser.add_argument("--server-pid", type=int, default=None, help="RSS 를 측정할 서버 PID (외부 서버)")
+    parser.add_argument("--concurrency", type=int, default=4, help="동시 요청 수 (rate 모드에서는 상한)")
+    parser.add_argument("--rate", type=float, default=None, help="초당 도착률 (지정 시 open-loop)")
+    parser.add_argument("--requests", type=int, default=None, help="총 요청 수")
+    parser.add_argument("--duration", type=float, default=None, help="측정 시간(초)")
+    parser.add_argument("--timeout", type=float, default=300.0, help="요청별 타임아웃(초)")
+    parser.add_argument("--rss-interval", type=float, default=1.0, help="RSS 샘플링 간격(초)")
+    parser.add_argument("--json", type=Path, default=None, help="결과 JSON 저장 경로")
+    args = parser.parse_args(argv)
+    if args.concurrency <= 0:
+        parser.error("--concurrency 는 1 이상이어야 합니다")
+    if args.rate is not None and args.rate <= 0:
+        parser.error("--rate 는 0 보다 커야 합니다")
+
+    try:
+        import httpx  # noqa: F401
+    except ImportError:
+        parser.error("httpx 가 필요합니다: pip install httpx")
+
+    corpus = load_corpus(args.corpus)
+    if not corpus:
+        parser.error(f"PDF/PPTX 파일이 없습니다: {args.corpus}")
+    if args.requests is None and args.duration is None:
+        args.requests = len(corpus)
+
+    url = args.url or f"http://127.0.0.1:{args.port}"
+    server = None
+    server_pid = args.server_pid
+    if args.start_server:
+        server = start_server(args.port, args.workers)
+        server_pid = server.pid
+
+    try:
+        wait_for_health(url)
+        report = asyncio.run(run_load(
+            url,
+            corpus,
+            concurrency=args.concurrency,
+            rate=args.rate,
+            total_requests=args.requests,
+            duration=args.duration,
+            timeout=args.timeout,
+            server_pid=server_pid,
+            rss_interval=args.rss_interval,
+        ))
+    finally:
+        if server is not None:
+            server.terminate()
+            server.wait(timeout=30)
+
+    report["config"].update({
+        "url": url,
+        "workers": args.workers if args.start_server else None,
+        "corpus_files": len(corpus),
+        "corpus_bytes": sum(len(c) for _, c in corpus),
+    })
+    output = json.dumps(report, ensure_ascii=False, indent=2)
+    if args.json:
+        args.json.write_text(output, encoding="utf-8")
+    print(output)
+    return 1 if report["server_error_rate"] > 0 else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
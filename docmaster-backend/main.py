@@ -10,19 +10,26 @@ FastAPI 기반, POST /parse 엔드포인트 제공.
 """
 
 import os
+import secrets
 import tempfile
+import uuid
 from datetime import datetime
 from pathlib import Path
 
-from fastapi import FastAPI, File, UploadFile, HTTPException
+from fastapi import FastAPI, File, Header, UploadFile, HTTPException
 from fastapi.middleware.cors import CORSMiddleware
-from fastapi.responses import FileResponse, PlainTextResponse
+from fastapi.responses import FileResponse, JSONResponse, PlainTextResponse, Response
 from fastapi import APIRouter
 
-from app.pdf_utils import pdf_to_markdown
-from app.pptx_utils import pptx_to_markdown
-from app.md_refine import refine_extracted_markdown
-from app.normalizer import apply_normalizations
+from app.extract_constants import TABLE_FORMAT_MARKDOWN, TABLE_FORMATS
+from app.pipeline import SUPPORTED_EXTENSIONS, convert_document
+from app.profiling import PROFILE_SUFFIX, run_profiled, save_profile, top_functions
+
+# 대용량 응답 직렬화: orjson 이 있으면 사용 (미설치 시 표준 JSONResponse)
+try:
+    import orjson
+except ImportError:
+    orjson = None
 
 app = FastAPI(
     title="DocMaster AI - Local Parsing Server",
@@ -45,8 +52,6 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
-SUPPORTED_EXTENSIONS = {".pdf", ".pptx"}
-
 # Vercel 배포 시 공식 예제처럼 /api prefix 사용 (로컬도 동일하게 /api/parse, /api/health)
 router = APIRouter(prefix="/api", tags=["api"])
 
@@ -57,6 +62,18 @@ REFINE_MD = os.environ.get("REFINE_MD", "true").lower() in ("1", "true", "yes")
 # 금액/날짜 정규화 적용 여부 (기본: True).
 NORMALIZE_MD = os.environ.get("NORMALIZE_MD", "true").lower() in ("1", "true", "yes")
 
+# 페이지/슬라이드·표 중복 제거 기본값 (기본: False). 요청별로 ?dedup=1 로 켤 수 있음.
+DEDUP_MD = os.environ.get("DEDUP_MD", "false").lower() in ("1", "true", "yes")
+
+# PPTX 그림 도형 OCR 기본값 (기본: False). 요청별로 ?ocr_images=1 로 켤 수 있음. pytesseract 필요.
+PPTX_IMAGE_OCR = os.environ.get("PPTX_IMAGE_OCR", "false").lower() in ("1", "true", "yes")
+
+# 요청별 프로파일링(/api/parse?profile=1, /api/profile/{file_id}) 관리자 토큰.
+# 미설정 시 프로파일링 비활성화. 요청 시 X-Admin-Token 헤더로 전달.
+PROFILE_ADMIN_TOKEN = os.environ.get("PROFILE_ADMIN_TOKEN", "")
+# /api/profile/{file_id} 의 top 상한
+PROFILE_TOP_MAX = 200
+
 # 추출 결과 저장 디렉토리. Vercel 서버리스에서는 /tmp 사용 (쓰기 가능)
 OUTPUTS_DIR = Path("/tmp/docmaster_outputs") if os.environ.get("VERCEL") else Path(__file__).parent / "outputs"
 OUTPUTS_DIR.mkdir(exist_ok=True)
@@ -72,11 +89,58 @@ async def health_check():
     }
 
 
+def _json_response(content: dict) -> Response:
+    """응답 dict 를 orjson 으로 직렬화 (수 MB 마크다운 문자열에서 표준 인코더보다 빠름)."""
+    if orjson is not None:
+        return Response(content=orjson.dumps(content), media_type="application/json")
+    return JSONResponse(content=content)
+
+
+def _run_parse_pipeline(
+    tmp_path: str,
+    ext: str,
+    use_dedup: bool,
+    table_format: str = TABLE_FORMAT_MARKDOWN,
+    ocr_images: bool = False,
+) -> tuple[str, dict]:
+    """서버 설정(REFINE_MD, NORMALIZE_MD)으로 변환 파이프라인 실행. 반환: (마크다운, 메타)."""
+    return convert_document(
+        tmp_path,
+        ext,
+        refine=REFINE_MD,
+        normalize=NORMALIZE_MD,
+        dedup=use_dedup,
+        table_format=table_format,
+        ocr_images=ocr_images,
+    )
+
+
+def _check_profile_admin(admin_token: str | None) -> None:
+    """프로파일링 관리자 토큰 확인. PROFILE_ADMIN_TOKEN 미설정 시 기능 자체를 비활성화."""
+    if not PROFILE_ADMIN_TOKEN:
+        raise HTTPException(status_code=403, detail="프로파일링이 비활성화되어 있습니다. (PROFILE_ADMIN_TOKEN 미설정)")
+    if not admin_token or not secrets.compare_digest(admin_token, PROFILE_ADMIN_TOKEN):
+        raise HTTPException(status_code=403, detail="프로파일링 권한이 없습니다.")
+
+
 @router.post("/parse")
-async def parse_document(file: UploadFile = File(...)):
+async def parse_document(
+    file: UploadFile = File(...),
+    dedup: bool | None = None,
+    table_format: str = TABLE_FORMAT_MARKDOWN,
+    ocr_images: bool | None = None,
+    profile: bool = False,
+    x_admin_token: str | None = Header(default=None),
+):
     """
     업로드된 PDF 또는 PPTX 파일을 마크다운으로 변환합니다.
     첨부 파일은 추출 완료 후 즉시 삭제되며, 추출 결과는 서버에 저장하지 않고 응답으로만 반환합니다.
+    dedup: 반복 페이지/슬라이드·표를 역참조로 교체 (미지정 시 DEDUP_MD 환경변수 기본값).
+    table_format: [[TABLE]] 블록 인코딩. markdown(기본) | csv(압축) | json(표는 meta.tables 에 열 배열로 반환).
+    ocr_images: (PPTX) 그림 도형 OCR (미지정 시 PPTX_IMAGE_OCR 환경변수 기본값).
+    profile: (관리자 전용, X-Admin-Token 헤더 필요) 파이프라인을 cProfile 로 실행하고
+             프로파일(.prof)만 OUTPUTS_DIR 에 저장. meta.profile.file_id 로
+             GET /api/profile/{file_id} 조회 가능.
 
     Returns:
         {
@@ -96,6 +160,15 @@ async def parse_document(file: UploadFile = File(...)):
             detail=f"지원하지 않는 파일 형식입니다: {ext}. PDF 또는 PPTX 파일만 업로드해주세요.",
         )
 
+    if table_format not in TABLE_FORMATS:
+        raise HTTPException(
+            status_code=400,
+            detail=f"지원하지 않는 표 형식입니다: {table_format}. {', '.join(TABLE_FORMATS)} 중 하나를 사용하세요.",
+        )
+
+    if profile:
+        _check_profile_admin(x_admin_token)
+
     # 임시 파일로 저장 후 처리
     with tempfile.NamedTemporaryFile(delete=False, suffix=ext) as tmp:
         content = await file.read()
@@ -103,34 +176,29 @@ async def parse_document(file: UploadFile = File(...)):
         tmp_path = tmp.name
 
     try:
-        parse_meta: dict = {}
-        if ext == ".pdf":
-            markdown_text = pdf_to_markdown(tmp_path, out_meta=parse_meta)
-        else:  # .pptx
-            markdown_text = pptx_to_markdown(tmp_path, out_meta=parse_meta)
-
-        # 추출 MD 1차 정제 (슬라이드 잔재, 반복 푸터, 빈 불릿, 구분선 축소 등)
-        if REFINE_MD:
-            markdown_text = refine_extracted_markdown(markdown_text)
-
-        # 금액/날짜 정규화 (보수적 적용)
-        if NORMALIZE_MD:
-            markdown_text = apply_normalizations(
-                markdown_text,
-                normalize_amount=True,
-                normalize_date=True,
+        use_dedup = DEDUP_MD if dedup is None else dedup
+        use_image_ocr = PPTX_IMAGE_OCR if ocr_images is None else ocr_images
+        if not profile:
+            markdown_text, parse_meta = _run_parse_pipeline(
+                tmp_path, ext, use_dedup, table_format, use_image_ocr
             )
-
-        # 메타: 표 개수 (최종 MD 기준)
-        parse_meta["table_count"] = markdown_text.count("[[TABLE]]")
+        else:
+            (markdown_text, parse_meta), profiler, elapsed = run_profiled(
+                _run_parse_pipeline, tmp_path, ext, use_dedup, table_format, use_image_ocr
+            )
+            # 프로파일(.prof)만 OUTPUTS_DIR 에 저장. 변환 결과(.md)는 인증 없는 /result 경로로
+            # 노출되므로 저장하지 않음.
+            file_id = f"{Path(file.filename).stem}_{datetime.now().strftime('%Y%m%d_%H%M%S')}_{uuid.uuid4().hex[:8]}"
+            save_profile(profiler, OUTPUTS_DIR, file_id)
+            parse_meta["profile"] = {"file_id": file_id, "elapsed_sec": round(elapsed, 3)}
 
         # 첨부 파일은 추출 후 즉시 삭제(finally에서 수행). 추출 결과는 서버에 저장하지 않고 응답으로만 반환.
-        return {
+        return _json_response({
             "markdown": markdown_text,
             "filename": file.filename,
             "file_type": ext,
             "meta": parse_meta,
-        }
+        })
 
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"파싱 중 오류가 발생했습니다: {str(e)}")
@@ -139,6 +207,30 @@ async def parse_document(file: UploadFile = File(...)):
         os.unlink(tmp_path)
 
 
+@router.get("/profile/{file_id}")
+async def get_profile_summary(
+    file_id: str,
+    top: int = 20,
+    sort: str = "cumulative",
+    x_admin_token: str | None = Header(default=None),
+):
+    """
+    (관리자 전용) 저장된 프로파일에서 pdf_utils / pptx_utils / md_refine / normalizer / dedup
+    모듈의 상위 top 개 함수를 반환합니다. sort: cumulative | tottime | ncalls
+    """
+    _check_profile_admin(x_admin_token)
+    if not 1 <= top <= PROFILE_TOP_MAX:
+        raise HTTPException(status_code=400, detail=f"top 은 1~{PROFILE_TOP_MAX} 사이여야 합니다: {top}")
+    profile_path = OUTPUTS_DIR / f"{file_id}{PROFILE_SUFFIX}"
+    if Path(file_id).name != file_id or not profile_path.exists():
+        raise HTTPException(status_code=404, detail=f"저장된 프로파일을 찾을 수 없습니다: {file_id}")
+    try:
+        summary = top_functions(profile_path, limit=top, sort=sort)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    return {"file_id": file_id, **summary}
+
+
 @router.get("/result/{file_id}")
 async def get_result_markdown(file_id: str):
     """
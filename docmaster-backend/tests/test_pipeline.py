@@ -0,0 +1,67 @@
+"""
+tests/test_pipeline.py
+app.pipeline.convert_document 회귀 테스트.
+
+실행 방법:
+  cd docmaster-backend
+  python -m pytest -q tests
+"""
+
+import csv
+import io
+
+from pptx import Presentation
+from pptx.util import Inches
+
+from app.extract_constants import TABLE_BLOCK_PATTERN
+from app.pipeline import convert_document
+
+FINANCIAL_ROWS = [
+    ["Item", "2023", "2024"],
+    ["Revenue", "12", "345"],
+    ["Cost", "1", "200"],
+    ["Margin", "11,145", "2,000원"],
+]
+
+
+def _write_table_pptx(path, rows):
+    prs = Presentation()
+    slide = prs.slides.add_slide(prs.slide_layouts[5])
+    slide.shapes.title.text = "Financials"
+    table = slide.shapes.add_table(len(rows), len(rows[0]), Inches(1), Inches(2), Inches(6), Inches(2)).table
+    for i, row in enumerate(rows):
+        for j, value in enumerate(row):
+            table.cell(i, j).text = value
+    prs.save(str(path))
+
+
+def test_csv_tables_survive_amount_normalization(tmp_path):
+    """csv 표의 쉼표 구분자·행 줄바꿈이 금액 정규화에 먹히지 않고, 셀 값만 정규화돼야 함."""
+    pptx_path = tmp_path / "fin.pptx"
+    _write_table_pptx(pptx_path, FINANCIAL_ROWS)
+
+    markdown_text, meta = convert_document(str(pptx_path), ".pptx", table_format="csv")
+
+    blocks = TABLE_BLOCK_PATTERN.findall(markdown_text)
+    assert len(blocks) == 1
+    assert list(csv.reader(io.StringIO(blocks[0]))) == [
+        ["Item", "2023", "2024"],
+        ["Revenue", "12", "345"],
+        ["Cost", "1", "200"],
+        ["Margin", "11145 KRW", "2000 KRW"],
+    ]
+    assert meta["table_count"] == 1
+
+
+def test_csv_and_json_cells_match(tmp_path):
+    """같은 표의 csv 셀과 json(meta.tables) 셀은 정규화 결과가 같아야 함."""
+    pptx_path = tmp_path / "fin.pptx"
+    _write_table_pptx(pptx_path, FINANCIAL_ROWS)
+
+    csv_md, _ = convert_document(str(pptx_path), ".pptx", table_format="csv")
+    _, json_meta = convert_document(str(pptx_path), ".pptx", table_format="json")
+
+    csv_rows = list(csv.reader(io.StringIO(TABLE_BLOCK_PATTERN.findall(csv_md)[0])))
+    table = json_meta["tables"][0]
+    assert table["header"] == csv_rows[0]
+    assert [list(row) for row in zip(*table["columns"])] == csv_rows[1:]